@@ -1,7 +1,129 @@
+import logging
+import re
+import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from resolution_checker import ResolutionChecker
-from itertools import combinations
-from cnf_converter import negate_formula, cnf_to_clauses
-from cnf_converter_ast import to_cnf, cnf_ast_to_clauses
+from cnf_converter import cnf_to_clauses, cnf_of_negation
+from cnf_converter_ast import to_cnf
+
+log = logging.getLogger(__name__)
+
+_BINARY_OP_RE = re.compile(r"\s*([∧∨→↔])\s*")
+_TIGHT_SPACE_RE = re.compile(r"(?<=[¬(])\s+|\s+(?=\))")
+
+def _canon(formula: str) -> str:
+    """
+    Return the canonical, interned spelling of a formula string.
+
+    Unicode is NFC-normalized and whitespace is made uniform (one space around
+    binary operators, none after ¬ or inside parentheses), so that "¬ P∨Q" and
+    "¬P ∨ Q" are stored as the same belief. Interning makes later dict lookups
+    and comparisons on the result mostly identity checks.
+    """
+    formula = unicodedata.normalize("NFC", formula)
+    formula = _BINARY_OP_RE.sub(r" \1 ", formula)
+    formula = _TIGHT_SPACE_RE.sub("", formula)
+    return sys.intern(" ".join(formula.split()))
+
+def _canon_query(formula: str) -> str:
+    """
+    Return the canonical spelling of a query formula: as _canon(), with pairs
+    of leading ¬ dropped, so that ¬¬Q and Q share an entailment cache entry.
+    Only queries are rewritten; beliefs keep the spelling they were added with.
+    """
+    formula = _canon(formula)
+    stripped = formula
+    while stripped.startswith("¬¬"):
+        stripped = stripped[2:]
+    return formula if stripped is formula else sys.intern(stripped)
+
+# Atom -> bit index table shared by all cached clauses, so that clauses of
+# different formulas can be combined without re-encoding them.
+_ATOM_IDS: dict[str, int] = {}
+
+# Formulas whose CNF would have more clauses than this are Tseitin-encoded
+# instead: linear in size, and equisatisfiable, which is all resolution needs.
+_TSEITIN_ABOVE = 64
+
+# Formulas are immutable strings and CNF conversion is deterministic, so the
+# clauses of each formula are computed and bitmask-encoded once and shared by
+# every entails() call.
+@lru_cache(maxsize=None)
+def _formula_clauses(formula: str) -> tuple[tuple[int, int], ...]:
+    """Return the encoded CNF clauses of a belief base formula (cached)."""
+    _, encoded = ResolutionChecker.encode_clauses(cnf_to_clauses(formula, _TSEITIN_ABOVE), _ATOM_IDS)
+    return tuple(encoded)
+
+@lru_cache(maxsize=None)
+def _formula_atoms(formula: str) -> int:
+    """Return the bitmask of all atoms occurring in a belief base formula (cached)."""
+    atoms = 0
+    for pos_mask, neg_mask in _formula_clauses(formula):
+        atoms |= pos_mask | neg_mask
+    return atoms
+
+def _unsatisfiable(cnf_clauses: list[tuple[int, int]]) -> bool:
+    """
+    Check if encoded clauses are unsatisfiable: redundant clauses are dropped,
+    unit propagation and pure literal elimination settle what they can, and
+    only the remaining clauses go through resolution.
+    """
+    cnf_clauses = ResolutionChecker.simplify(cnf_clauses)
+    cnf_clauses, unsatisfiable = ResolutionChecker.propagate(cnf_clauses)
+    if unsatisfiable is not None:
+        return unsatisfiable
+    return ResolutionChecker.resolve_bitsets(cnf_clauses)
+
+# Keyed by sets of formulas like _entails, so every hitting set tree node of a
+# contraction is a new entry: bounded the same way.
+@lru_cache(maxsize=4096)
+def _is_inconsistent(formulas: frozenset[str]) -> bool:
+    """Check if a set of formulas is unsatisfiable on its own (cached)."""
+    return _unsatisfiable([clause for formula in formulas for clause in _formula_clauses(formula)])
+
+@lru_cache(maxsize=None)
+def _negated_formula_clauses(formula: str) -> tuple[tuple[int, int], ...]:
+    """Return the encoded CNF clauses of the negation of a query formula (cached)."""
+    _, encoded = ResolutionChecker.encode_clauses(cnf_of_negation(formula, _TSEITIN_ABOVE), _ATOM_IDS)
+    return tuple(encoded)
+
+# Entailment only depends on which formulas are in the base, not on their
+# priorities or on the BeliefBase instance, so results are cached by content.
+# Bases revisited during contraction, or rebuilt identically, get a cache hit.
+@lru_cache(maxsize=4096)
+def _entails(formulas: frozenset[str], entailed_formula: str) -> bool:
+    """Check if a set of formulas entails a formula (cached). See BeliefBase.entails."""
+    negated_cnf_entailed_clauses = _negated_formula_clauses(entailed_formula)
+
+    cnf_clauses = []
+    base_atoms = 0
+    for formula in formulas:
+        cnf_clauses.extend(_formula_clauses(formula))
+        base_atoms |= _formula_atoms(formula)
+
+    # Only build the debug output when it will actually be emitted
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Belief base: %s", list(formulas))
+        log.debug("CNF Clauses: %s", cnf_clauses)
+
+    query_atoms = 0
+    for pos_mask, neg_mask in negated_cnf_entailed_clauses:
+        query_atoms |= pos_mask | neg_mask
+
+    # If ¬φ shares no atom with the base, BB ∪ {¬φ} can only be unsatisfiable
+    # because one of the two parts is, so skip resolving them together
+    if not query_atoms & base_atoms:
+        return _is_inconsistent(formulas) or _unsatisfiable(list(negated_cnf_entailed_clauses))
+
+    # Combine the belief base clauses with the negated formula clauses
+    cnf_clauses.extend(negated_cnf_entailed_clauses)
+
+    # If unsatisfiable, then the belief base entails the formula
+    return _unsatisfiable(cnf_clauses)
+
 
 class BeliefBase:
     """
@@ -10,25 +132,31 @@ class BeliefBase:
     """
     def __init__(self):
         """Initialize an empty belief base with prioritized formulas."""
-        self.formulas = []  # List of tuples (formula, priority)
+        # Maps formula -> priority; dicts keep insertion order, so this doubles
+        # as the ordered list of beliefs while giving O(1) membership checks.
+        self._index: dict[str, int] = {}
 
     def add_formula(self, formula: str, priority: int = 1):
         """
         Add a formula to the belief base if not already present.
         Formulas must be provided as strings.
         """
-        if not self.contains(formula):
-            self.formulas.append((formula, priority))
+        formula = _canon(formula)
+        if formula not in self._index:
+            # Convert to CNF now, so entailment checks only look up cached clauses
+            _formula_clauses(formula)
+            self._index[formula] = priority
 
     def remove_formula(self, formula: str):
         """Remove a formula from the belief base if it exists."""
-        self.formulas = [(f, p) for f, p in self.formulas if f != formula]
+        formula = _canon(formula)
+        self._index.pop(formula, None)
 
     def empty(self) -> None:
         """
         Empty the belief base by removing all formulas.
         """
-        self.formulas = []
+        self._index = {}
         print("Belief base emptied.")
 
     def contains(self, formula: str) -> bool:
@@ -36,13 +164,14 @@ class BeliefBase:
         Check if a formula is present in the belief base.
         Returns True if the formula is found, False otherwise.
         """
-        return any(f == formula for f, _ in self.formulas)
+        formula = _canon(formula)
+        return formula in self._index
     
     def list_formulas(self) -> list:
         """
         Returns a copy of the list of formulas in the belief base.
         """
-        return [f for f, _ in self.formulas]
+        return list(self._index)
     
     def entails(self, entailed_formula: str) -> bool:
         """
@@ -53,88 +182,136 @@ class BeliefBase:
         
         Returns True if the formula is entailed, False otherwise.
         """
-        negated_entailed_formula = negate_formula(entailed_formula)
-        negated_cnf_entailed_clauses = cnf_to_clauses(negated_entailed_formula)
-        #print("Negated formula:", negated_cnf_entailed_clauses)
-        
-        cnf_clauses = []
-        for formula, _ in self.formulas:  
-            cnf_formula_ast = to_cnf(formula, return_ast=True)
-            cnf_clauses_ast = cnf_ast_to_clauses(cnf_formula_ast)
-            cnf_clauses.extend(cnf_clauses_ast)
-
-        print("Belief base:", self.list_formulas())
-        print("CNF Clauses:", cnf_clauses)
-
-        # Combine the belief base clauses with the negated formula clauses
-        cnf_clauses.extend(negated_cnf_entailed_clauses)
+        return _entails(frozenset(self._index), _canon_query(entailed_formula))
 
-        #print("Final CNF Clauses with negated formula included:", cnf_clauses)
-
-        # Apply resolution; if unsatisfiable, then the belief base entails the formula
-        return ResolutionChecker.resolution(cnf_clauses)
-    
-    def contraction(self, formula: str) -> bool:
+    def contraction(self, formula: str, workers: int | None = None) -> bool:
         """
-        Contract a formula from the belief base using partial meet contraction.
+        Contract a formula from the belief base using kernel contraction.
         Removes the formula while preserving as many high-priority beliefs as possible.
+
+        The φ-kernels are the minimal subsets of the base that entail φ. Removing
+        at least one belief from every kernel (a hitting set) is enough for φ to
+        no longer be entailed, so only beliefs involved in deriving φ are touched.
+        The hitting set is chosen greedily, preferring low-priority beliefs.
     
         Args:
         formula: The formula to remove
+        workers: If greater than 1, check the nodes of each hitting set tree
+            level in parallel on this many processes. Only worth it for large
+            belief bases, as process startup dominates otherwise.
         
         Returns:
         bool: True if contraction was successful, False if formula wasn't present
         """
+        formula = _canon_query(formula)
         # If formula isn't entailed, nothing to contract
         if not self.entails(formula):
             print(f"Formula '{formula}' is not entailed by belief base.")
             return False
 
-        # Find all maximal subsets that don't entail the formula
-        maximal_subsets = []
-        current_formulas = self.list_formulas()
-    
-        # Try different sized combinations, from largest to smallest
-        for size in range(len(self.formulas), 0, -1):
-            for subset in combinations(self.formulas, size):
-                # Create temporary belief base with this subset
-                temp_bb = BeliefBase()
-                for f, p in subset:
-                    temp_bb.add_formula(f, p)
-            
-                # If this subset doesn't entail the formula
-                if not temp_bb.entails(formula):
-                    # Check if it's maximal
-                    is_maximal = True
-                    for f, p in self.formulas:
-                        if (f, p) not in subset:
-                            temp_bb.add_formula(f, p)
-                            if not temp_bb.entails(formula):
-                                is_maximal = False
-                                break
-                            temp_bb.remove_formula(f)
-                
-                    if is_maximal:
-                        maximal_subsets.append(subset)
-                        break  # Found a maximal subset at this size
-        
-            # If we found any maximal subsets at this size, stop looking
-            if maximal_subsets:
-                break
-
-        if not maximal_subsets:
+        if workers is not None and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                kernels = self._find_kernels(formula, executor)
+        else:
+            kernels = self._find_kernels(formula)
+        if any(not kernel for kernel in kernels):
+            # Even the empty base entails it (tautology): no removal can help
             print("Could not find suitable contraction.")
             return False
 
-        # Select best subset based on priorities
-        best_subset = max(maximal_subsets, 
-                        key=lambda s: (len(s), sum(p for _, p in s)))
-    
         # Update belief base
-        self.formulas = list(best_subset)
+        for f in self._hitting_set(kernels):
+            del self._index[f]
         print(f"Contracted '{formula}'. Remaining beliefs: {self.list_formulas()}")
         return True
-    
+
+    def _entrenchment(self) -> dict[str, tuple[int, int]]:
+        """
+        Sort key of each belief, from least to most entrenched: lower priority
+        first and, between equal priorities, the most recently added first.
+        Ties never depend on set iteration order, so contraction is reproducible.
+        """
+        return {f: (priority, -position) for position, (f, priority) in enumerate(self._index.items())}
+
+    def _find_kernel(self, formulas: frozenset[str], formula: str) -> frozenset[str]:
+        """
+        Shrink a set of formulas that entails the formula into one of its kernels
+        (a minimal entailing subset), by dropping every formula that is not needed.
+        """
+        kernel = set(formulas)
+        for f in sorted(formulas, key=self._entrenchment().get):
+            kernel.discard(f)
+            if not _entails(frozenset(kernel), formula):
+                kernel.add(f)  # Needed for the entailment: f is part of the kernel
+        return frozenset(kernel)
+
+    def _find_kernels(self, formula: str, executor: ProcessPoolExecutor | None = None) -> list[frozenset[str]]:
+        """
+        Find all kernels of the formula in the belief base (Reiter's hitting set tree).
+
+        Each node removes a set of beliefs from the base. If the rest still entails
+        the formula, it contains a kernel not hit yet; one child node is created per
+        belief of that kernel. Nodes whose rest no longer entails the formula are leaves.
+
+        The tree is built level by level. With an executor, the entailment checks
+        of all nodes on a level run in parallel before the level is expanded.
+        """
+        base = frozenset(self._index)
+        kernels = []
+        visited = set()
+        level = [frozenset()]
+        while level:
+            rests = [base - removed for removed in level]
+            if executor is not None:
+                entailed = list(executor.map(_entails, rests, repeat(formula)))
+            else:
+                entailed = [_entails(rest, formula) for rest in rests]
+
+            next_level = []
+            for removed, rest, is_entailed in zip(level, rests, entailed):
+                if not is_entailed:
+                    continue
+
+                # Reuse a known kernel inside the rest before searching for a new one
+                kernel = next((k for k in kernels if k <= rest), None)
+                if kernel is None:
+                    kernel = self._find_kernel(rest, formula)
+                    kernels.append(kernel)
+
+                for f in kernel:
+                    child = removed | {f}
+                    if child not in visited:
+                        visited.add(child)
+                        next_level.append(child)
+            level = next_level
+        return kernels
+
+    def _hitting_set(self, kernels: list[frozenset[str]]) -> set[str]:
+        """
+        Pick beliefs to remove so that every kernel loses at least one of them.
+
+        Greedily takes the lowest-priority belief (ties: the one in most remaining
+        kernels, then the most recently added), then drops picks that turned out
+        to be redundant, most entrenched first, so that no belief is removed
+        without need.
+        """
+        entrenchment = self._entrenchment()
+        hitting_set = set()
+        unhit = list(kernels)
+        while unhit:
+            counts = {}
+            for kernel in unhit:
+                for f in kernel:
+                    counts[f] = counts.get(f, 0) + 1
+            pick = min(counts, key=lambda f: (entrenchment[f][0], -counts[f], entrenchment[f][1]))
+            hitting_set.add(pick)
+            unhit = [kernel for kernel in unhit if pick not in kernel]
+
+        for f in sorted(hitting_set, key=entrenchment.get, reverse=True):
+            if all(kernel & (hitting_set - {f}) for kernel in kernels):
+                hitting_set.discard(f)
+        return hitting_set
+
     def expansion(self, formula: str, priority: int = 1) -> bool:
         """
         Expand the belief base with a new formula.
@@ -146,13 +323,15 @@ class BeliefBase:
         Returns:
             bool: True if expansion was successful, False if formula was already present
         """
+        formula = _canon(formula)
         # Check if formula is already present
         if self.contains(formula):
             print(f"Formula '{formula}' is already in the belief base.")
             return False
             
-        # Add the new formula
-        self.formulas.append((formula, priority))
+        # Add the new formula, converting it to CNF once up front
+        _formula_clauses(formula)
+        self._index[formula] = priority
         print(f"Added '{formula}' with priority {priority}")
         return True
 
@@ -1,5 +1,7 @@
 # Conjunctive Normal Form (CNF) Converter
 # This module converts a propositional logic formula into its CNF equivalent.
+# Formulas are parsed once into an AST and transformed with the functions of
+# cnf_converter_ast.py, instead of being rewritten as strings.
 
 """
     Strange symbols that we use and I don't have on my keyboard:
@@ -10,406 +12,85 @@
     →: IMP (implication)
 """
 
+from cnf_converter_ast import (TOKEN_RE, Parser, Literal, Not, to_cnf, ast_to_nnf, ast_to_cnf_clauses,
+                               cnf_clause_count, ast_to_tseitin_clauses)
+
+# Tokens that are not atom names
+_OPERATOR_TOKENS = frozenset("()¬∧∨→↔")
+
 def negate_formula(formula: str) -> str:
     """
-    Negates a formula by replacing:
+    Negates a formula:
         A with ¬A
         (A ∧ B) with ¬(A ∧ B)
-        (A ∨ B) with ¬(A ∨ B)
+        ¬A with A (double negation is removed)
     """
-    if formula.startswith('¬'):
-        # If already negated, remove the negation
-        return formula[1:]
-    elif formula.startswith('(') and formula.endswith(')'):
-        # If the formula is parenthesized, negate the entire expression
-        return f"¬({formula[1:-1]})"
-    else:
-        return f"¬{formula}"
-
-def find_expression_start(formula: str) -> int:
-    """Finds the starting index of the expression to the left of our operator"""
-    
-    balance = 0
-    
-    for i in range(len(formula)-1, -1, -1):
-        if formula[i] == ')':
-            balance += 1
-        elif formula[i] == '(':
-            if balance == 0:
-                return i + 1
-            balance -= 1
-        elif balance == 0 and formula[i] in "∧∨→↔¬":
-            return i + 1
-    return 0
-
-def find_expression_end(formula: str) -> int:
-    """Finds the ending index of the expression to the right of our operator"""
+    ast = Parser(formula).parse()
+    if isinstance(ast, Not):
+        return repr(ast.operand)
+    return repr(Not(ast))
 
-    balance = 0
-    for i in range(len(formula)):
-        if formula[i] == '(':
-            balance += 1
-        elif formula[i] == ')':
-            if balance == 0:
-                return i - 1
-            balance -= 1
-        elif balance == 0 and i > 0 and formula[i] in "∧∨→↔":
-            return i - 1
-    return len(formula) - 1
-
-# --- CNF Conversion Pipeline ---
-def eliminate_iff(formula: str) -> str:
+def cnf_to_clauses(formula: str, tseitin_above: int | None = None) -> list:
     """
-    Step 1: Eliminates iff: ↔ 
+    Converts a formula into CNF and returns it as a list of clauses.
     
-    Replaces:
-        A ↔ B with (A → B) ∧ (B → A)
-    """
-
-    i = 0
-    result = ""
-    while i < len(formula):
-        # Checks if next character is ↔ and apply the transformation
-        if i + 1 < len(formula) and formula[i:i+1] == "↔":
-            # Find the beginning of the expression to the left of ↔
-            left_start = find_expression_start(formula[:i-1])
-            left_expr = formula[left_start:i]
-            
-            # Find the end of the expression to the right of ↔
-            right_end = find_expression_end(formula[i+1:]) + i + 1
-            right_expr = formula[i+1:right_end+1]
-            
-            # Replace A ↔ B with (A → B) ∧ (B → A)
-            replacement = f"(({left_expr} → {right_expr}) ∧ ({right_expr} → {left_expr}))"
-            
-            # Remove the left_expr from the result to avoid duplication
-            result = result[:-len(left_expr)]
-            
-            # Add the replacement
-            result += replacement
-            i = right_end + 1
-        else:
-            result += formula[i]
-            i += 1
-
-    return result
+    Each clause is represented as a set of literals.
 
-def eliminate_imp(formula: str) -> str:
+    If tseitin_above is given and the CNF would have more clauses than that,
+    the Tseitin encoding is returned instead. It is only equisatisfiable with
+    the formula, so use it for satisfiability checks only.
     """
-    Step 2: Eliminates implication: →
-    
-    Replaces:
-        A → B with ¬A ∨ B
-    """
-    i = 0
-    result = ""
-    while i < len(formula):
-        # Checks if current character is → and apply the transformation
-        if i < len(formula) and formula[i:i+1] == "→":
-            # Find expressions on both sides of →
-            left_start = find_expression_start(formula[:i-1])
-            left_expr = formula[left_start:i]
-            left_expr = left_expr.strip()
-            
-            right_end = find_expression_end(formula[i+1:]) + i + 1
-            right_expr = formula[i+1:right_end+1]
-            
-            result = result[:-(len(left_expr)+1)]
-            
-            # Replace A → B with ¬A ∨ B
-            # The negation only applies to left_expr
-            replacement = f"(¬{left_expr} ∨ {right_expr})"
-            result += replacement
-            
-            i = right_end + 1
-        else:
-            result += formula[i]
-            i += 1
+    ast = Parser(formula).parse()
+    if tseitin_above is None:
+        return ast_to_cnf_clauses(ast)
+    return _ast_to_clauses(ast, tseitin_above)
 
-    return result
+def _ast_to_clauses(ast, tseitin_above: int) -> list:
+    """Clauses of the CNF of an AST, or of its Tseitin encoding if the CNF is too large."""
+    if cnf_clause_count(ast_to_nnf(ast)) > tseitin_above:
+        return ast_to_tseitin_clauses(ast)
+    return ast_to_cnf_clauses(ast)
 
-def push_negations_inwards(formula: str) -> str:
-    """
-    Step 3: Move negations inward (Negation Normal Form)
-    
-    Applies:
-    1. Double negation: ¬¬A = A
-    2. De Morgan's laws: 
-       - ¬(A ∧ B) = ¬A ∨ ¬B
-       - ¬(A ∨ B) = ¬A ∧ ¬B
+def cnf_of_negation(formula: str, tseitin_above: int | None = None) -> list:
     """
-    i = 0
-    result = ""
-    while i < len(formula):
-        # Check for negation operator
-        if formula[i] == '¬':
-            # Skip the negation symbol
-            i += 1
-            
-            # If next character is a space, skip it
-            if i < len(formula) and formula[i] == ' ':
-                i += 1
-                
-            # Check for double negation: ¬¬A = A
-            if i < len(formula) and formula[i] == '¬':
-                # Skip the second negation
-                i += 1
-                
-                # Skip space if present
-                if i < len(formula) and formula[i] == ' ':
-                    i += 1
-                    
-                # Find the expression being double-negated
-                if i < len(formula) and formula[i] == '(':
-                    # It's a parenthesized expression
-                    expr_end = find_expression_end(formula[i:]) + i
-                    expr = formula[i:expr_end+1]
-                    result += expr  # Add without negations
-                    i = expr_end + 1
-                else:
-                    # It's a simple symbol
-                    result += formula[i]
-                    i += 1
-                    
-            # Check for De Morgan's laws: ¬(A ∧ B) = ¬A ∨ ¬B or ¬(A ∨ B) = ¬A ∧ ¬B
-            elif i < len(formula) and formula[i] == '(':
-                # Find the entire expression inside parentheses
-                expr_end = find_expression_end(formula[i:]) + i
-                expr = formula[i+1:expr_end]  # Remove outer parentheses
-                
-                # Check if this is a conjunction or disjunction
-                if '∧' in expr:
-                    # Apply De Morgan: ¬(A ∧ B) = ¬A ∨ ¬B
-                    sub_expressions = expr.split('∧')
-                    negated_expr = []
-                    for sub_expr in sub_expressions:
-                        sub_expr = sub_expr.strip()
-                        negated_expr.append(f"¬{sub_expr}")
-                    result += f"({' ∨ '.join(negated_expr)})"
-                    
-                elif '∨' in expr:
-                    # Apply De Morgan: ¬(A ∨ B) = ¬A ∧ ¬B
-                    sub_expressions = expr.split('∨')
-                    negated_expr = []
-                    for sub_expr in sub_expressions:
-                        sub_expr = sub_expr.strip()
-                        negated_expr.append(f"¬{sub_expr}")
-                    result += f"({' ∧ '.join(negated_expr)})"
-                    
-                else:
-                    # No conjunction or disjunction, just add the negation
-                    result += f"¬({expr})"
-                
-                i = expr_end + 1
-                
-            else:
-                # Simple negation of a variable or other expression
-                result += f"¬{formula[i]}"
-                i += 1
-        else:
-            result += formula[i]
-            i += 1
-            
-    return result
+    Converts the negation of a formula directly into a list of clauses.
 
-def distribute_or(formula: str) -> str:
-    """
-    Step 4: Distribute ∨ over ∧ to achieve CNF
-    
-    Applies the distributive property:
-        (A ∨ (B ∧ C)) = ((A ∨ B) ∧ (A ∨ C))
-        ((A ∧ B) ∨ C) = ((A ∨ C) ∧ (B ∨ C))
-    """
-    # This is a non-trivial task for arbitrary formulas.
-    # For a full implementation, you would need to parse the formula into an AST.
-    # Here is a simple recursive approach for formulas already in NNF and with parentheses.
-
-    # Base case: if there are no ANDs or ORs, return as is
-    if '∧' not in formula and '∨' not in formula:
-        return formula
-
-    # Find the main operator at the top level (not inside parentheses)
-    balance = 0
-    for i, char in enumerate(formula):
-        if char == '(':
-            balance += 1
-        elif char == ')':
-            balance -= 1
-        elif balance == 0:
-            if char == '∨':
-                # Split into left and right
-                left = formula[:i].strip()
-                right = formula[i+1:].strip()
-                # If either side contains an AND at the top level, distribute
-                if '∧' in left:
-                    # (A ∧ B) ∨ C => (A ∨ C) ∧ (B ∨ C)
-                    left_parts = [part.strip() for part in left.split('∧')]
-                    distributed = [f"({lp} ∨ {right})" for lp in left_parts]
-                    return ' ∧ '.join(distributed)
-                if '∧' in right:
-                    # A ∨ (B ∧ C) => (A ∨ B) ∧ (A ∨ C)
-                    right_parts = [part.strip() for part in right.split('∧')]
-                    distributed = [f"({left} ∨ {rp})" for rp in right_parts]
-                    return ' ∧ '.join(distributed)
-    # If no distribution needed, return as is
-    return formula
+    The formula is parsed once and its AST is wrapped in a Not node before
+    running the CNF transformation, instead of negating the string and
+    converting the result in a second pass. This also negates compound
+    formulas correctly: ¬(A ∧ B) becomes the clause {¬A, ¬B}.
 
-def normalize_spacing(formula: str) -> str:
-    """
-    Normalizes spacing in a formula by:
-    1. Removing duplicate spaces
-    2. Ensuring exactly one space before and after operation symbols
-    3. Removing spaces before and after parentheses
-    
-    Operation symbols: ∧, ∨, ¬, ↔, →
-    """
-    # Define logical operators
-    operators = ["∧", "∨", "¬", "↔", "→"]
-    
-    # Add a single space before and after each operator
-    for op in operators:
-        # Replace operator with space+operator+space
-        formula = formula.replace(op, f" {op} ")
-    
-    # Remove spaces before and after parentheses
-    formula = formula.replace("( ", "(").replace(" )", ")")
-    
-    # Simply find multiple spaces and replace them by a single space
-    while "  " in formula:
-        formula = formula.replace("  ", " ")
-    
-    # Trim spaces at the beginning and end
-    formula = formula.strip()
-    
-    return formula
+    Literal queries (A or ¬A), the most common kind, skip the parser and
+    the CNF transformation: their negation is a single unit clause. The atom
+    still goes through Literal, so invalid names raise ValueError as they
+    would in a compound formula.
 
-def normalize_parentheses(formula: str) -> str:
+    tseitin_above works as in cnf_to_clauses().
     """
-    Normalizes parentheses in a formula by:
-    1. Removing redundant nested parentheses around atomic propositions
-    2. Removing redundant outer parentheses from the whole formula
-    3. Preserving parentheses that are needed for proper operator precedence
-    
-    Examples:
-    - ((a)) becomes (a)
-    - (a) becomes a (when not part of a larger expression)
-    - Preserves parentheses for complex expressions
-    """
-    # Use a stack-based approach for parentheses balancing
-    def simplify_expr(expr: str) -> str:
-        # Base case: single letter/symbol or empty string
-        expr = expr.strip()
-        if len(expr) <= 1:
-            return expr
-            
-        # Check if expression is surrounded by unnecessary parentheses
-        if expr[0] == '(' and expr[-1] == ')':
-            # Ensure these are matching parentheses, not part of separate sub-expressions
-            balance = 0
-            for i in range(len(expr) - 1):  # Exclude the last char
-                if expr[i] == '(':
-                    balance += 1
-                elif expr[i] == ')':
-                    balance -= 1
-                # If balance goes to 0 before the end, the outer parens aren't a matching pair
-                if balance == 0 and i < len(expr) - 1:
-                    break
-            else:  # No break occurred - the outer parentheses match
-                # Recursively simplify the inner expression
-                inner = simplify_expr(expr[1:-1])
-                
-                # If inner is a simple symbol or already balanced expression
-                if (len(inner) == 1 or 
-                    ('∧' not in inner and '∨' not in inner and '¬' not in inner and '→' not in inner and '↔' not in inner)):
-                    return inner
-                
-                # If the inner part has operators, keep the parentheses
-                return f"({inner})"
-        
-        # If expression contains operators, process parts around them
-        for op in ['∧', '∨', '→', '↔']:
-            if op in expr:
-                # Don't split inside parenthesized sub-expressions
-                balance = 0
-                parts = []
-                last_idx = 0
-                
-                for i, char in enumerate(expr):
-                    if char == '(':
-                        balance += 1
-                    elif char == ')':
-                        balance -= 1
-                    elif balance == 0 and char == op:
-                        parts.append(expr[last_idx:i])
-                        last_idx = i + 1
-                
-                if parts:
-                    parts.append(expr[last_idx:])
-                    simplified_parts = [simplify_expr(part) for part in parts]
-                    return op.join(simplified_parts)
-        
-        # Handle negation specially
-        if expr.startswith('¬'):
-            inner = simplify_expr(expr[1:])
-            return f"¬{inner}"
-            
-        return expr
-    
-    # Initial simplification
-    simplified = simplify_expr(formula)
-    
-    # Ensure we don't have extra spaces around parentheses
-    simplified = simplified.replace('( ', '(').replace(' )', ')')
-    
-    return simplified
+    tokens = TOKEN_RE.findall(formula)
+    if len(tokens) == 1 and tokens[0] not in _OPERATOR_TOKENS:
+        return [{'¬' + Literal(tokens[0]).name}]
+    if len(tokens) == 2 and tokens[0] == '¬' and tokens[1] not in _OPERATOR_TOKENS:
+        return [{Literal(tokens[1]).name}]
 
-def cnf_to_clauses(formula: str) -> list:
-    """
-    Converts a CNF formula into a list of clauses.
-    
-    Each clause is represented as a set of literals.
-    """
-    # Split the formula by conjunctions
-    clauses = formula.split('∧')
-    
-    # Convert each clause into a set of literals with spaces removed
-    return [set(literal.strip() for literal in clause.strip().split('∨')) for clause in clauses]
+    negated_ast = Not(Parser(formula).parse())
+    if tseitin_above is None:
+        return ast_to_cnf_clauses(negated_ast)
+    return _ast_to_clauses(negated_ast, tseitin_above)
 
 if __name__ == "__main__":
     # Testing the CNF conversion 
     formula = "r ↔ (p ∨ s)"
-    print("Original formula:", normalize_spacing(formula))
-
-    # Step 1: Eliminate IFF (↔)
-    formula_no_iff = eliminate_iff(formula)
-    formula_no_iff = normalize_parentheses(formula_no_iff)
-    formula_no_iff = normalize_spacing(formula_no_iff)
-    
-    print("After eliminating IFF:", formula_no_iff)
-
-    # Step 2: Eliminate IMP (→)
-    formula_no_imp = eliminate_imp(formula_no_iff)
-    formula_no_imp = normalize_parentheses(formula_no_imp)
-    formula_no_imp = normalize_spacing(formula_no_imp)
-
-    print("After eliminating IMP:", formula_no_imp)
-    
-    # Step 3: Push negations inwards
-    formula_nnf = push_negations_inwards(formula_no_imp)
-    formula_nnf = normalize_parentheses(formula_nnf)
-    formula_nnf = normalize_spacing(formula_nnf)
-
-    print("After pushing negations inwards:", formula_nnf)
+    print("Original formula:", formula)
+    print("CNF:", to_cnf(formula))
+    print("Clauses:", cnf_to_clauses(formula))
 
-    #Step 4: Distribute OR over AND
-    formula_cnf = distribute_or(formula_nnf)
-    formula_cnf = normalize_spacing(formula_cnf)
-    formula_cnf = normalize_parentheses(formula_cnf)
-    print("After distributing the OR:", formula_cnf)
+    # Testing the negation
+    print("Negated formula:", negate_formula(formula))
+    print("Clauses of the negation:", cnf_of_negation(formula))
 
     # Testing the CNF to clauses conversion
-    # Assuming the formula is already in CNF
-    cnf_formula = "P ∨ Q ∧ R ∨ S"
+    cnf_formula = "(P ∨ Q) ∧ (R ∨ S)"
     print("CNF formula:", cnf_formula)
     clauses = cnf_to_clauses(cnf_formula)
     print("Clauses:", clauses)
@@ -8,40 +8,86 @@
 """
 
 
-from copy import deepcopy # For checking convergence in distribution
+import re # For tokenizing formulas
+from concurrent.futures import ProcessPoolExecutor # For batch conversion
+from functools import lru_cache # For caching CNF conversions
 
 # --- AST Node Definitions ---
 
-class Formula:
+class _HashConsed(type):
+    """
+    Metaclass that hash-conses formula nodes: constructing a node that already
+    exists (same class, same children) returns the existing instance.
+
+    Children are themselves unique, so they are keyed by identity. The table
+    keeps its nodes alive, which also keeps those identities from being reused.
+    It holds about as much as ast_to_cnf's cache already does (every CNF is a
+    subgraph of the table), plus the linear-size intermediate steps; weak
+    references were measured to make conversion about 50% slower.
+    """
+    _instances = {}
+
+    def __call__(cls, *args):
+        key = cls._cons_key(*args)
+        node = _HashConsed._instances.get(key)
+        if node is None:
+            node = _HashConsed._instances[key] = super().__call__(*args)
+        return node
+
+class Formula(metaclass=_HashConsed):
     """Base class for all formula AST nodes."""
+    # Nodes only hold fixed attributes; slots make them smaller than a __dict__.
+    # _repr caches the string form, which never changes as nodes are immutable
+    __slots__ = ('_repr',)
+
+    @classmethod
+    def _cons_key(cls, *children):
+        # Hash-consing key: children are unique nodes, so their identity is enough
+        return (cls, *map(id, children))
+
     def __eq__(self, other):
-        # Structural equality check
-        return isinstance(other, type(self)) and self.__dict__ == other.__dict__
+        # Nodes are hash-consed, so structurally equal formulas are the same object
+        return self is other
 
     def __hash__(self):
-        # Simple hash based on representation; ensure subclasses implement __repr__ well
-        return hash(repr(self))
+        return id(self)
 
     def __repr__(self):
-        raise NotImplementedError("Subclasses must implement __repr__")
+        # Shared (hash-consed) subtrees are formatted once instead of every time they occur
+        try:
+            return self._repr
+        except AttributeError:
+            self._repr = text = self._format()
+            return text
+
+    def _format(self):
+        raise NotImplementedError("Subclasses must implement _format")
 
 class Literal(Formula):
+    __slots__ = ('name',)
+
+    @classmethod
+    def _cons_key(cls, name):
+        return (cls, name)
+
     def __init__(self, name):
         if not isinstance(name, str) or not name.replace('_', '').isalnum() or name[0].isdigit():
             # Allow letters, numbers, underscores, but not starting with a digit
             raise ValueError(f"Invalid literal name: '{name}'")
         self.name = name
 
-    def __repr__(self):
+    def _format(self):
         return self.name
 
 class Not(Formula):
+    __slots__ = ('operand',)
+
     def __init__(self, operand):
         if not isinstance(operand, Formula):
              raise TypeError("Operand must be a Formula instance")
         self.operand = operand
 
-    def __repr__(self):
+    def _format(self):
         op_repr = repr(self.operand)
         # Add parentheses if operand is a binary operation to avoid ambiguity like ¬A ∧ B
         if isinstance(self.operand, (And, Or, Implies, Iff)):
@@ -51,14 +97,16 @@ class Not(Formula):
 
 class BinaryOp(Formula):
     """Base class for binary operators."""
-    def __init__(self, left, right, symbol):
+    __slots__ = ('left', 'right')
+    symbol = None # For representation, set by each operator class
+
+    def __init__(self, left, right):
         if not isinstance(left, Formula) or not isinstance(right, Formula):
             raise TypeError("Operands must be Formula instances")
         self.left = left
         self.right = right
-        self.symbol = symbol # For representation
 
-    def __repr__(self):
+    def _format(self):
         # Add parentheses around operands if they are binary ops of lower/equal precedence
         # Simplification: Add parentheses around *any* binary operand for clarity
         left_repr = repr(self.left)
@@ -72,50 +120,56 @@ class BinaryOp(Formula):
         return f"{left_repr} {self.symbol} {right_repr}"
 
 class And(BinaryOp):
-    def __init__(self, left, right):
-        super().__init__(left, right, "∧")
+    __slots__ = ()
+    symbol = "∧"
 
 class Or(BinaryOp):
-    def __init__(self, left, right):
-        super().__init__(left, right, "∨")
+    __slots__ = ()
+    symbol = "∨"
 
 class Implies(BinaryOp):
-    def __init__(self, left, right):
-        super().__init__(left, right, "→")
+    __slots__ = ()
+    symbol = "→"
 
 class Iff(BinaryOp):
-    def __init__(self, left, right):
-        super().__init__(left, right, "↔")
+    __slots__ = ()
+    symbol = "↔"
 
 
 # --- Parser (Recursive Descent) ---
 # Handles precedence: ¬ > ∧ > ∨ > → > ↔
 
+# A token is an operator, a parenthesis, or a run of other non-space characters (an atom)
+TOKEN_RE = re.compile(r"[()¬∧∨→↔]|[^\s()¬∧∨→↔]+")
+
+# Binding strength of binary operators: ¬ > ∧ > ∨ > → > ↔
+BINARY_PRECEDENCE = {"↔": 1, "→": 2, "∨": 3, "∧": 4}
+BINARY_OPERATORS = {"↔": Iff, "→": Implies, "∨": Or, "∧": And}
+
 class Parser:
     def __init__(self, formula_string):
-        # Normalize input string: Add spaces around operators and parentheses
-        # for easier tokenization. Remove redundant spaces.
-        s = formula_string.strip()
-        for op in ["↔", "→", "∨", "∧", "¬", "(", ")"]:
-            s = s.replace(op, f" {op} ")
-        self.tokens = [token for token in s.split() if token] # Basic tokenizer
+        # Single-pass tokenizer: whitespace is skipped by the regex itself.
+        # A None sentinel marks the end, so the current token can always be read
+        # with a plain index instead of a bounds-checked method call.
+        self.tokens = TOKEN_RE.findall(formula_string)
+        self.tokens.append(None)
         self.pos = 0
         # print(f"Tokens: {self.tokens}") # Debugging
 
     def parse(self) -> Formula:
-        if not self.tokens:
+        if self.tokens[0] is None:
             raise ValueError("Cannot parse empty formula")
-        formula = self._parse_iff()
-        if self.pos < len(self.tokens):
+        formula = self._parse_binary(1)
+        if self.tokens[self.pos] is not None:
             # If not all tokens were consumed, likely a syntax error
             raise ValueError(f"Unexpected token '{self.tokens[self.pos]}' at position {self.pos}")
         return formula
 
     def _current_token(self):
-        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+        return self.tokens[self.pos]
 
     def _consume(self, expected_token=None):
-        token = self._current_token()
+        token = self.tokens[self.pos]
         if expected_token and token != expected_token:
             raise ValueError(f"Expected '{expected_token}' but found '{token}' at position {self.pos}")
         if token is None:
@@ -123,61 +177,41 @@ class Parser:
         self.pos += 1
         return token
 
-    # Parse based on precedence (lowest first)
-    def _parse_iff(self):
-        left = self._parse_implies()
-        while self._current_token() == "↔":
-            self._consume("↔")
-            right = self._parse_implies()
-            left = Iff(left, right)
-        return left
-
-    def _parse_implies(self):
-        left = self._parse_or()
-        while self._current_token() == "→":
-            self._consume("→")
-            right = self._parse_or()
-            left = Implies(left, right)
-        return left
-
-    def _parse_or(self):
-        left = self._parse_and()
-        while self._current_token() == "∨":
-            self._consume("∨")
-            right = self._parse_and()
-            left = Or(left, right)
-        return left
-
-    def _parse_and(self):
-        left = self._parse_not() # Or parse_factor if not is highest precedence
-        while self._current_token() == "∧":
-            self._consume("∧")
-            right = self._parse_not() # Or parse_factor
-            left = And(left, right)
-        return left
-
-    def _parse_not(self):
-        if self._current_token() == "¬":
-            self._consume("¬")
-            operand = self._parse_not() # Allows for stacked negations like ¬¬A
+    # Parse binary operators by precedence climbing: one call handles every
+    # operator that binds at least as tightly as min_precedence, instead of
+    # descending through one method per precedence level for every operand.
+    # All binary operators are left-associative.
+    def _parse_binary(self, min_precedence):
+        tokens = self.tokens
+        left = self._parse_unary()
+        while True:
+            token = tokens[self.pos]
+            precedence = BINARY_PRECEDENCE.get(token, 0)
+            if precedence < min_precedence:
+                return left
+            self.pos += 1
+            right = self._parse_binary(precedence + 1)
+            left = BINARY_OPERATORS[token](left, right)
+
+    # Parse negations, literals and parenthesized expressions
+    def _parse_unary(self):
+        token = self.tokens[self.pos]
+        if token == "¬":
+            self.pos += 1
+            operand = self._parse_unary() # Allows for stacked negations like ¬¬A
             return Not(operand)
-        return self._parse_factor()
-
-    # Parse literals and parenthesized expressions
-    def _parse_factor(self):
-        token = self._current_token()
-        if token == "(":
-            self._consume("(")
-            expr = self._parse_iff() # Start parsing from the lowest precedence inside parens
+        elif token == "(":
+            self.pos += 1
+            expr = self._parse_binary(1) # Start parsing from the lowest precedence inside parens
             self._consume(")")
             return expr
         elif token is None:
              raise ValueError("Unexpected end of input, expected literal or '('")
-        elif token in ["∧", "∨", "→", "↔", ")"]:
+        elif token in BINARY_PRECEDENCE or token == ")":
             raise ValueError(f"Unexpected operator '{token}' at position {self.pos}, expected literal or '('")
         else:
             # Assume it's a literal
-            self._consume()
+            self.pos += 1
             try:
                 return Literal(token)
             except ValueError as e:
@@ -187,163 +221,210 @@ class Parser:
 
 # --- AST Transformation Functions ---
 
+def _children(node: Formula) -> tuple:
+    """Direct subformulas of a node, in order."""
+    kind = type(node)
+    if kind is Not:
+        return (node.operand,)
+    if kind is Literal:
+        return ()
+    if isinstance(node, BinaryOp):
+        return (node.left, node.right)
+    return ()
+
+
+def _rebuild_bottom_up(formula: Formula, rebuild, children=_children) -> Formula:
+    """
+    Rebuilds an AST bottom-up with an explicit stack instead of recursion.
+
+    rebuild(node, *new_children) is called once the children of node have been
+    rebuilt, and returns the new node. Results are kept by node identity, so a
+    subtree shared by several parents is only rebuilt once, and deeply nested
+    formulas cannot hit Python's recursion limit.
+    """
+    results = {}
+    stack = [formula]
+    while stack:
+        node = stack[-1]
+        if id(node) in results:
+            stack.pop()
+            continue
+        kids = children(node)
+        pending = [kid for kid in kids if id(kid) not in results]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        results[id(node)] = rebuild(node, *(results[id(kid)] for kid in kids))
+    return results[id(formula)]
+
+
+# The converter runs steps 1-3 in a single pass (ast_to_nnf). The separate
+# steps below are not used by it anymore and are only kept as public API.
+
 def eliminate_iff_ast(formula: Formula) -> Formula:
     """Step 1: Eliminate ↔ using (A → B) ∧ (B → A)"""
-    if isinstance(formula, Literal):
-        return formula
-    elif isinstance(formula, Not):
-        return Not(eliminate_iff_ast(formula.operand))
-    elif isinstance(formula, (And, Or, Implies)):
-        # Recursively apply to children
-        return type(formula)(eliminate_iff_ast(formula.left),
-                             eliminate_iff_ast(formula.right))
-    elif isinstance(formula, Iff):
-        # A ↔ B => (A → B) ∧ (B → A)
-        left = formula.left
-        right = formula.right
-        # Recursively apply to the components *before* creating the new structure
-        left_elim = eliminate_iff_ast(left)
-        right_elim = eliminate_iff_ast(right)
-        imp1 = Implies(left_elim, right_elim)
-        imp2 = Implies(right_elim, left_elim)
-        # Important: Recursively apply to the *newly created* structure too
-        # Although eliminate_iff won't find more IFFs here, it's good practice
-        # for consistency with other recursive transformations.
-        return eliminate_iff_ast(And(imp1, imp2))
-    else:
-        raise TypeError(f"Unknown formula type: {type(formula)}")
+    def rebuild(node, *kids):
+        kind = type(node)
+        if kind is Literal:
+            return node
+        elif kind is Not:
+            return Not(kids[0])
+        elif kind in (And, Or, Implies):
+            return type(node)(*kids)
+        elif kind is Iff:
+            # A ↔ B => (A → B) ∧ (B → A), with A and B already free of ↔
+            left, right = kids
+            return And(Implies(left, right), Implies(right, left))
+        else:
+            raise TypeError(f"Unknown formula type: {type(node)}")
+
+    return _rebuild_bottom_up(formula, rebuild)
 
 
 def eliminate_imp_ast(formula: Formula) -> Formula:
     """Step 2: Eliminate → using ¬A ∨ B"""
-    if isinstance(formula, Literal):
-        return formula
-    elif isinstance(formula, Not):
-        return Not(eliminate_imp_ast(formula.operand))
-    elif isinstance(formula, (And, Or)):
-        return type(formula)(eliminate_imp_ast(formula.left),
-                             eliminate_imp_ast(formula.right))
-    elif isinstance(formula, Implies):
-        # A → B => ¬A ∨ B
-        left = formula.left
-        right = formula.right
-        # Recursively apply to components *before* creating the new structure
-        left_elim = eliminate_imp_ast(left)
-        right_elim = eliminate_imp_ast(right)
-        # Important: Recursively apply to the result of the transformation
-        return eliminate_imp_ast(Or(Not(left_elim), right_elim))
-    # Note: Iff should have been eliminated already, but handle defensively
-    elif isinstance(formula, Iff):
-         raise TypeError("Implication elimination run before IFF elimination finished.")
-    else:
-        raise TypeError(f"Unknown formula type: {type(formula)}")
+    def rebuild(node, *kids):
+        kind = type(node)
+        if kind is Literal:
+            return node
+        elif kind is Not:
+            return Not(kids[0])
+        elif kind in (And, Or):
+            return type(node)(*kids)
+        elif kind is Implies:
+            # A → B => ¬A ∨ B, with A and B already free of →
+            left, right = kids
+            return Or(Not(left), right)
+        # Note: Iff should have been eliminated already, but handle defensively
+        elif kind is Iff:
+            raise TypeError("Implication elimination run before IFF elimination finished.")
+        else:
+            raise TypeError(f"Unknown formula type: {type(node)}")
+
+    return _rebuild_bottom_up(formula, rebuild)
 
 
 def move_negation_inwards_ast(formula: Formula) -> Formula:
-    """Step 3: Move ¬ inwards (NNF) using De Morgan's and double negation"""
-    if isinstance(formula, Literal):
-        return formula
-    elif isinstance(formula, And):
-        return And(move_negation_inwards_ast(formula.left),
-                   move_negation_inwards_ast(formula.right))
-    elif isinstance(formula, Or):
-         return Or(move_negation_inwards_ast(formula.left),
-                   move_negation_inwards_ast(formula.right))
-    elif isinstance(formula, Not):
-        operand = formula.operand
-        if isinstance(operand, Literal):
-            return formula # ¬ is already innermost
-        elif isinstance(operand, Not):
-            # ¬¬A => A
-            # Recursively apply to the inner part A
-            return move_negation_inwards_ast(operand.operand)
-        elif isinstance(operand, And):
-            # ¬(A ∧ B) => ¬A ∨ ¬B
-            # Recursively apply to the newly formed structure
-            return move_negation_inwards_ast(
-                Or(Not(operand.left), Not(operand.right))
-            )
-        elif isinstance(operand, Or):
-            # ¬(A ∨ B) => ¬A ∧ ¬B
-             # Recursively apply to the newly formed structure
-            return move_negation_inwards_ast(
-                And(Not(operand.left), Not(operand.right))
-            )
+    """
+    Step 3: Move ¬ inwards (NNF) using De Morgan's and double negation
+
+    Negations are pushed down as a flag instead of building new Not nodes:
+    each node is visited together with whether an odd number of ¬ is above it.
+    """
+    results = {}
+    stack = [(formula, False)]
+    while stack:
+        node, negated = stack[-1]
+        key = (id(node), negated)
+        if key in results:
+            stack.pop()
+            continue
+        kind = type(node)
+
+        if kind is Literal:
+            # ¬ is already innermost
+            results[key] = Not(node) if negated else node
+        elif kind is Not:
+            # ¬¬A => A: the operand is visited with the flag flipped
+            inner = (id(node.operand), not negated)
+            if inner not in results:
+                stack.append((node.operand, not negated))
+                continue
+            results[key] = results[inner]
+        elif kind in (And, Or):
+            left = (id(node.left), negated)
+            right = (id(node.right), negated)
+            if left not in results or right not in results:
+                stack.append((node.left, negated))
+                stack.append((node.right, negated))
+                continue
+            # ¬(A ∧ B) => ¬A ∨ ¬B and ¬(A ∨ B) => ¬A ∧ ¬B
+            if (kind is And) != negated:
+                results[key] = And(results[left], results[right])
+            else:
+                results[key] = Or(results[left], results[right])
         # Note: Implies and Iff should be gone, but handle defensively
-        elif isinstance(operand, (Implies, Iff)):
-             raise TypeError("NNF transformation run before implications/iff eliminated.")
+        elif kind in (Implies, Iff):
+            raise TypeError("NNF transformation run before implications/iff eliminated.")
         else:
-            raise TypeError(f"Unknown formula type inside Not: {type(operand)}")
-    # Note: Implies and Iff should be gone, but handle defensively
-    elif isinstance(formula, (Implies, Iff)):
-        raise TypeError("NNF transformation run before implications/iff eliminated.")
-    else:
-        raise TypeError(f"Unknown formula type: {type(formula)}")
+            raise TypeError(f"Unknown formula type: {type(node)}")
+        stack.pop()
+    return results[(id(formula), False)]
 
 
 def distribute_or_over_and_ast(formula: Formula) -> Formula:
-    """Step 4: Distribute ∨ over ∧"""
-    if isinstance(formula, (Literal, Not)):
-        return formula # Base case
-
-    if isinstance(formula, And):
-        # Distribute in children first
-        left = distribute_or_over_and_ast(formula.left)
-        right = distribute_or_over_and_ast(formula.right)
-        return And(left, right)
-
-    if isinstance(formula, Or):
-        # Distribute in children first
-        left = distribute_or_over_and_ast(formula.left)
-        right = distribute_or_over_and_ast(formula.right)
-
-        # Check for distribution: A ∨ (B ∧ C) => (A ∨ B) ∧ (A ∨ C)
-        if isinstance(right, And):
-            # Create the two new OR clauses
-            new_left_or = Or(left, right.left)
-            new_right_or = Or(left, right.right)
-            # Combine them with AND
-            new_and = And(new_left_or, new_right_or)
-            # VERY IMPORTANT: Recursively distribute within the *newly created* structure
-            return distribute_or_over_and_ast(new_and)
-
-        # Check for distribution: (A ∧ B) ∨ C => (A ∨ C) ∧ (B ∨ C)
-        if isinstance(left, And):
-            # Create the two new OR clauses
-            new_left_or = Or(left.left, right)
-            new_right_or = Or(left.right, right)
-            # Combine them with AND
-            new_and = And(new_left_or, new_right_or)
-             # VERY IMPORTANT: Recursively distribute within the *newly created* structure
-            return distribute_or_over_and_ast(new_and)
-
-        # If no distribution rule applied at this level, return the potentially
-        # transformed children within the Or node
-        return Or(left, right)
-
-    # Note: Implies, Iff, Not should not be the top-level operator here if NNF was correct
+    """
+    Step 4: Distribute ∨ over ∧
+
+    Works bottom-up in a single pass: the children of every node are fully
+    distributed before the node itself, so the result is already in CNF.
+    """
+    # Distributed (left, right) pairs of this call, by identity: nodes are
+    # hash-consed, so shared subformulas bring back the same pairs
+    memo = {}
+
+    def rebuild(node, *kids):
+        kind = type(node)
+        if kind in (Literal, Not):
+            return node # Base case
+        elif kind is And:
+            return And(*kids)
+        elif kind is Or:
+            # Combine the two CNF operands
+            return _distribute_or(*kids, memo)
+        # Note: Implies, Iff should not appear here if NNF was correct
+        else:
+            raise TypeError(f"Unexpected formula type during distribution: {type(node)}")
+
+    return _rebuild_bottom_up(formula, rebuild)
+
+
+def _distribute_or(left: Formula, right: Formula, memo: dict) -> Formula:
+    """
+    Builds the CNF of left ∨ right, where both operands are already in CNF.
+    Only the newly created Or nodes are visited, never the operands' clauses again.
+    """
+    key = (id(left), id(right))
+    result = memo.get(key)
+    if result is not None:
+        return result
+    # A ∨ (B ∧ C) => (A ∨ B) ∧ (A ∨ C)
+    if type(right) is And:
+        result = And(_distribute_or(left, right.left, memo), _distribute_or(left, right.right, memo))
+    # (A ∧ B) ∨ C => (A ∨ C) ∧ (B ∨ C)
+    elif type(left) is And:
+        result = And(_distribute_or(left.left, right, memo), _distribute_or(left.right, right, memo))
+    # Both sides are clauses: their disjunction is a clause too
     else:
-         raise TypeError(f"Unexpected formula type during distribution: {type(formula)}")
+        result = Or(left, right)
+    memo[key] = result
+    return result
 
 
+# Not used by the converter anymore (cnf_ast_to_clauses walks the clauses
+# itself); only kept as public API.
 def extract_literals_from_clause(clause_node: Formula) -> set[str]:
     """
-    Recursively extracts all literals (as strings) from an AST node
+    Extracts all literals (as strings) from an AST node
     representing a single clause (a disjunction of literals, or a single literal).
     """
     literals_set = set()
+    stack = [clause_node]
 
-    def collect(node: Formula):
+    # Walk the disjunction with a stack; literal names are read directly instead of
+    # calling repr(), which would rebuild the string through the node's __repr__
+    while stack:
+        node = stack.pop()
         if isinstance(node, Or):
-            # Recursively collect from both sides of the disjunction
-            collect(node.left)
-            collect(node.right)
+            stack.append(node.right)
+            stack.append(node.left)
         elif isinstance(node, Literal):
             # Base case: found a positive literal
-            literals_set.add(repr(node))
+            literals_set.add(node.name)
         elif isinstance(node, Not) and isinstance(node.operand, Literal):
             # Base case: found a negative literal
-            literals_set.add(repr(node))
+            literals_set.add('¬' + node.operand.name)
         elif isinstance(node, Not) and not isinstance(node.operand, Literal):
              # This shouldn't happen in a valid NNF/CNF clause
              raise TypeError(f"Invalid CNF clause structure: Found Not({type(node.operand)})")
@@ -351,7 +432,6 @@ def extract_literals_from_clause(clause_node: Formula) -> set[str]:
              # This shouldn't happen in a valid CNF clause (e.g., finding an And)
              raise TypeError(f"Invalid CNF clause structure: Found unexpected node type {type(node)}")
 
-    collect(clause_node)
     return literals_set
 
 
@@ -363,44 +443,203 @@ def cnf_ast_to_clauses(cnf_ast: Formula) -> list[set[str]]:
     Assumes the input AST is the result of the CNF conversion process
     (a conjunction of disjunctions of literals).
     """
-    clauses_list = []
-
-    def find_conjuncts(node: Formula):
-        """Recursively traverses the AND nodes to find individual clauses."""
-        if isinstance(node, And):
-            # Explore both branches of the conjunction
-            find_conjuncts(node.left)
-            find_conjuncts(node.right)
-        # If it's not an And, it must be a clause (Or, Literal, or Not)
-        # Note: A valid CNF formula shouldn't contain Implies/Iff here.
-        elif isinstance(node, (Or, Literal, Not)):
-            try:
-                clause_literals = extract_literals_from_clause(node)
-                if clause_literals: # Avoid adding empty sets if something weird happens
-                    clauses_list.append(clause_literals)
-            except TypeError as e:
-                # Propagate errors from literal extraction
-                raise TypeError(f"Error extracting literals from potential clause node {node}: {e}")
-        else:
-             # Should not encounter other types like Implies/Iff at the top level of CNF
-             raise TypeError(f"Unexpected node type in CNF structure: {type(node)}")
-
     # Handle the edge case of an empty input or a formula that somehow reduces
     # to a non-standard node type (though this shouldn't happen with the main converter)
     if not isinstance(cnf_ast, Formula):
          # Or perhaps return [] or raise error depending on desired behavior for invalid input
          return []
 
-    find_conjuncts(cnf_ast)
+    # One iterative walk: And nodes are split further, and the Or spine below
+    # each of them is collected into a clause right away, left to right
+    clauses_list = []
+    and_stack = [cnf_ast]
+    while and_stack:
+        node = and_stack.pop()
+        if type(node) is And:
+            and_stack.append(node.right)
+            and_stack.append(node.left)
+            continue
+
+        clause_literals = set()
+        or_stack = [node]
+        while or_stack:
+            item = or_stack.pop()
+            kind = type(item)
+            if kind is Or:
+                or_stack.append(item.right)
+                or_stack.append(item.left)
+            elif kind is Literal:
+                clause_literals.add(item.name)
+            elif kind is Not and type(item.operand) is Literal:
+                clause_literals.add('¬' + item.operand.name)
+            elif node is item:
+                # Should not encounter other types like Implies/Iff at the top level of CNF
+                raise TypeError(f"Unexpected node type in CNF structure: {kind}")
+            else:
+                raise TypeError(f"Error extracting literals from potential clause node {node}: "
+                                f"Invalid CNF clause structure: Found unexpected node {item}")
+        clauses_list.append(clause_literals)
+
+    return drop_redundant_clauses(clauses_list)
+
+
+def drop_redundant_clauses(clauses: list[set[str]]) -> list[set[str]]:
+    """
+    Removes clauses that do not change the meaning of a clause list:
+        1. Tautologies such as {p, ¬p}, which are always true
+        2. Clauses subsumed by another clause (S ⊆ C makes C redundant),
+           including duplicates
+    The remaining clauses keep their original order.
+    """
+    candidates = []
+    for index, clause in enumerate(clauses):
+        if not any(literal[0] == '¬' and literal[1:] in clause for literal in clause):
+            candidates.append((index, clause))
+
+    # Shorter clauses first, so every possible subsumer is seen before its supersets.
+    # Each kept clause is indexed under one of its literals: a subsumer of C is
+    # always found under one of C's literals.
+    candidates.sort(key=lambda item: len(item[1]))
+    kept_by_literal = {}
+    kept = []
+    for index, clause in candidates:
+        if any(kept_clause <= clause
+               for literal in clause
+               for kept_clause in kept_by_literal.get(literal, ())):
+            continue
+        kept_by_literal.setdefault(next(iter(clause)), []).append(clause)
+        kept.append((index, clause))
+
+    kept.sort(key=lambda item: item[0])
+    return [clause for _, clause in kept]
+
+
+# --- CNF Conversion Orchestrator ---
 
-    # If the original formula was just a single clause (no 'And' nodes),
-    # find_conjuncts would have added it directly. If it was empty or invalid,
-    # the list might be empty.
+@lru_cache(maxsize=None)
+def ast_to_cnf(ast: Formula) -> Formula:
+    """
+    Runs the CNF transformation steps on an already parsed formula AST.
+    Returns the CNF AST.
 
-    return clauses_list
+    Results are cached by AST structure, so a formula that is converted again
+    (possibly written with different spacing or parentheses) reuses the earlier
+    result. The returned AST is shared and must not be modified.
+    """
+    # 5. Distribute OR over AND (a single bottom-up pass)
+    return distribute_or_over_and_ast(ast_to_nnf(ast))
 
 
-# --- CNF Conversion Orchestrator ---
+def ast_to_nnf(ast: Formula) -> Formula:
+    """
+    Runs the CNF transformation steps up to negation normal form:
+    only ∧, ∨ and ¬ directly on literals are left.
+
+    Steps 2-4 are fused into one traversal. Each node is visited together with
+    its polarity (whether an odd number of ¬ is above it), and ↔ and → are
+    rewritten for that polarity on the spot:
+        A ↔ B  => (¬A ∨ B) ∧ (¬B ∨ A)      ¬(A ↔ B) => (A ∧ ¬B) ∨ (B ∧ ¬A)
+        A → B  => ¬A ∨ B                   ¬(A → B) => A ∧ ¬B
+    The result is the same as running eliminate_iff_ast, eliminate_imp_ast and
+    move_negation_inwards_ast in turn, without building the intermediate trees.
+    """
+    results = {}
+    stack = [(ast, False)]
+    while stack:
+        node, negated = stack[-1]
+        key = (id(node), negated)
+        if key in results:
+            stack.pop()
+            continue
+
+        kind = type(node)
+        if kind is Literal:
+            results[key] = Not(node) if negated else node
+            stack.pop()
+            continue
+        # The (subformula, polarity) pairs this node is built from
+        if kind is Not:
+            needed = ((node.operand, not negated),)
+        elif kind is And or kind is Or:
+            needed = ((node.left, negated), (node.right, negated))
+        elif kind is Implies:
+            needed = ((node.left, not negated), (node.right, negated))
+        elif kind is Iff:
+            needed = ((node.left, False), (node.left, True), (node.right, False), (node.right, True))
+        else:
+            raise TypeError(f"Unknown formula type: {kind}")
+
+        pending = [pair for pair in needed if (id(pair[0]), pair[1]) not in results]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+
+        parts = [results[(id(child), child_negated)] for child, child_negated in needed]
+        if kind is Not:
+            results[key] = parts[0]
+        elif kind is Iff:
+            left, not_left, right, not_right = parts
+            if negated:
+                results[key] = Or(And(left, not_right), And(right, not_left))
+            else:
+                results[key] = And(Or(not_left, right), Or(not_right, left))
+        elif kind is Implies:
+            results[key] = And(*parts) if negated else Or(*parts)
+        elif (kind is And) != negated:
+            results[key] = And(*parts)
+        else:
+            results[key] = Or(*parts)
+    return results[(id(ast), False)]
+
+
+def ast_to_cnf_clauses(ast: Formula) -> list[set[str]]:
+    """
+    Converts a formula AST straight into a list of CNF clauses, without
+    building the distributed AST.
+
+    Works bottom-up on the NNF, with every subformula as a list of clauses:
+        cnf(A ∧ B) = cnf(A) + cnf(B)
+        cnf(A ∨ B) = [a ∪ b for every clause a of cnf(A) and b of cnf(B)]
+    Duplicate and tautological clauses are dropped as soon as they appear, so
+    they are never multiplied again further up. The result is the same clause
+    set as cnf_ast_to_clauses(ast_to_cnf(ast)).
+    """
+    return [set(clause) for clause in _cnf_clause_tuple(ast)]
+
+
+@lru_cache(maxsize=None)
+def _cnf_clause_tuple(ast: Formula) -> tuple[frozenset[str], ...]:
+    """Clauses of ast_to_cnf_clauses as frozensets (cached per AST, like ast_to_cnf)."""
+    def rebuild(node, *kids):
+        kind = type(node)
+        if kind is Literal:
+            return [frozenset((node.name,))]
+        if kind is Not:
+            return [frozenset(('¬' + node.operand.name,))]
+        if kind is And:
+            return kids[0] + kids[1]
+        # Or: same clause order as _distribute_or, right operand outermost
+        left, right = kids
+        clauses = []
+        seen = set()
+        for right_clause in right:
+            for left_clause in left:
+                clause = left_clause | right_clause
+                if clause in seen or any(literal[0] == '¬' and literal[1:] in clause for literal in clause):
+                    continue
+                seen.add(clause)
+                clauses.append(clause)
+        return clauses
+
+    def children(node):
+        # In NNF, ¬ only sits on literals, so only ∧ and ∨ have subformulas to visit
+        kind = type(node)
+        return (node.left, node.right) if kind is And or kind is Or else ()
+
+    clauses = _rebuild_bottom_up(ast_to_nnf(ast), rebuild, children)
+    return tuple(drop_redundant_clauses(clauses))
+
 
 def to_cnf(formula_string: str, return_ast=False) -> Formula | str:
     """
@@ -428,26 +667,7 @@ def to_cnf(formula_string: str, return_ast=False) -> Formula | str:
 
     # --- Perform Transformations ---
     try:
-        # 2. Eliminate IFF (↔)
-        ast_no_iff = eliminate_iff_ast(ast)
-        # 3. Eliminate IMP (→)
-        ast_no_imp = eliminate_imp_ast(ast_no_iff)
-        # 4. Move Negations Inwards (NNF)
-        ast_nnf = move_negation_inwards_ast(ast_no_imp)
-        # 5. Distribute OR over AND (repeatedly until no changes)
-        prev_ast = None
-        current_ast = ast_nnf
-        loop_count = 0 # Safety break for potential infinite loops (shouldn't happen)
-        MAX_LOOPS = 100
-        while prev_ast != current_ast:
-            if loop_count > MAX_LOOPS:
-                 raise RecursionError("Distribution did not converge; potential infinite loop.")
-            prev_ast = deepcopy(current_ast)
-            current_ast = distribute_or_over_and_ast(prev_ast)
-            loop_count += 1
-
-        final_cnf_ast = current_ast
-
+        final_cnf_ast = ast_to_cnf(ast)
     except (TypeError, ValueError, RecursionError) as e:
          # Catch errors during transformation steps
         error_msg = f"Error during CNF transformation: {e}"
@@ -461,7 +681,93 @@ def to_cnf(formula_string: str, return_ast=False) -> Formula | str:
         return final_cnf_ast
     else:
         return repr(final_cnf_ast)
-    
+
+
+def to_cnf_batch(formula_strings: list[str], workers: int | None = None) -> list[str]:
+    """
+    Converts many formula strings to CNF strings, see to_cnf.
+
+    Formulas are independent, so with workers greater than 1 they are converted
+    in parallel on that many processes. Only worth it for large batches or
+    large formulas, as process startup dominates otherwise.
+    """
+    if workers is None or workers <= 1:
+        return [to_cnf(formula_string) for formula_string in formula_strings]
+    chunksize = max(1, len(formula_strings) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(to_cnf, formula_strings, chunksize=chunksize))
+
+
+# --- Tseitin Encoding ---
+# Distribution can be exponential: (a1 ∧ b1) ∨ ... ∨ (an ∧ bn) has 2ⁿ clauses.
+# The Tseitin encoding names every subformula with a fresh atom instead, giving
+# a linear number of clauses that is satisfiable exactly when the formula is
+# (but not equivalent to it, so it is only meant for satisfiability checks).
+
+# Auxiliary atoms are named '#<n>': '#' can never appear in a parsed atom.
+# Each distinct subformula gets one name for the whole process, so formulas
+# sharing a subformula also share its atom. This is sound, as the clauses that
+# define the atom are the same wherever it appears. The table grows with the
+# number of distinct compound subformulas that are encoded, like the hash-cons
+# table of the nodes themselves, not with the number of encodings: converting
+# the same formula again does not create new atoms.
+_tseitin_names: dict[Formula, str] = {}
+
+def cnf_clause_count(nnf_ast: Formula) -> int:
+    """
+    Number of clauses distribute_or_over_and_ast would produce for an NNF AST,
+    computed without building them.
+    """
+    def rebuild(node, *kids):
+        if isinstance(node, And):
+            return kids[0] + kids[1]
+        if isinstance(node, Or):
+            return kids[0] * kids[1]
+        return 1 # A literal is a single clause
+
+    return _rebuild_bottom_up(nnf_ast, rebuild)
+
+
+def ast_to_tseitin_clauses(ast: Formula) -> list[set[str]]:
+    """
+    Converts a formula AST into an equisatisfiable list of clauses with the
+    Tseitin encoding.
+
+    Works on the NNF, where every subformula occurs positively, so only the
+    direction aux → subformula is needed (Plaisted-Greenbaum polarity):
+        aux ≡ A ∧ B  gives  {¬aux, A}, {¬aux, B}
+        aux ≡ A ∨ B  gives  {¬aux, A, B}
+    Shared subformulas are the same hash-consed node and get a single atom.
+    """
+    clauses = []
+
+    def rebuild(node, *kids):
+        if isinstance(node, Literal):
+            return node.name
+        if isinstance(node, Not):
+            return '¬' + node.operand.name
+        aux = _tseitin_names.get(node)
+        if aux is None:
+            aux = _tseitin_names[node] = f"#{len(_tseitin_names)}"
+        if isinstance(node, And):
+            clauses.append({'¬' + aux, kids[0]})
+            clauses.append({'¬' + aux, kids[1]})
+        else:
+            clauses.append({'¬' + aux, kids[0], kids[1]})
+        return aux
+
+    root = _rebuild_bottom_up(ast_to_nnf(ast), rebuild)
+    clauses.append({root})
+    return clauses
+
+
+def to_cnf_tseitin(formula_string: str) -> list[set[str]]:
+    """
+    Converts a propositional logic formula string into an equisatisfiable
+    list of clauses of linear size. See ast_to_tseitin_clauses.
+    """
+    return ast_to_tseitin_clauses(Parser(formula_string).parse())
+
 
 # --- Example Usage ---
 
@@ -1,4 +1,5 @@
-from typing import List, Set, Tuple
+from collections import deque
+from typing import AbstractSet, Dict, FrozenSet, List, Tuple
 
 class ResolutionChecker:
     """
@@ -6,34 +7,35 @@ class ResolutionChecker:
     """
     
     @staticmethod 
-    def resolve(clause1: Set[str], clause2: Set[str]) -> List[Set[str]]:
+    def resolve(clause1: AbstractSet[str], clause2: AbstractSet[str]) -> List[FrozenSet[str]]:
         """
         Apply resolution rule to two clauses and return all possible resolvents (new clauses).
         A resolvent is formed by resolving a pair of complementary literals from the two clauses.
+
+        The clauses are only read, so sets and frozensets are both accepted as they are.
+        Resolvents are frozensets: hashable, so they can be deduplicated in a set directly.
         """
         resolvents = []
+        merged = None  # Union of both clauses, built on the first clash only
         
         # Check each literal in the first clause against the second clause
         for literal in clause1:
             # The complementary literal is the same literal but of "opposite negation"
-            
-            if literal.startswith('¬'):
-                complementary = literal[1:]  # Remove negation
-            else:
-                complementary = '¬' + literal  # Add negation
+            complementary = literal[1:] if literal.startswith('¬') else '¬' + literal
             
             # If the complementary literal is in the second clause, we can resolve (remove both)
             if complementary in clause2:
                 # Create a new clause by merging both clauses and removing the resolved literals
-                resolvent = (clause1.union(clause2) - {literal, complementary})
+                if merged is None:
+                    merged = frozenset(clause1).union(clause2)
+                resolvent = merged - {literal, complementary}
+                if not resolvent:
+                    return [resolvent]  # Empty clause: nothing else matters to the caller
                 
                 # Avoid adding trivial clauses (tautologies like P ∨ ¬P)
-                is_tautology = False
-                for lit in resolvent:
-                    # Check if the resolvent contains both a literal and its negation
-                    if (lit.startswith('¬') and lit[1:] in resolvent) or ('¬' + lit in resolvent):
-                        is_tautology = True
-                        break
+                # It is one if an atom occurs both negated and plain: a single set intersection
+                negated_atoms = {lit[1:] for lit in resolvent if lit.startswith('¬')}
+                is_tautology = not negated_atoms.isdisjoint(resolvent)
                 
                 if not is_tautology:
                     resolvents.append(resolvent) # Add the new resolvent to the list
@@ -41,7 +43,7 @@ class ResolutionChecker:
         return resolvents
     
     @staticmethod
-    def resolution(clauses: List[Set[str]]) -> bool:
+    def resolution(clauses: List[AbstractSet[str]]) -> bool:
         """
         Apply resolution repeatedly until either:
             1. An empty clause is derived (meaning the clauses are unsatisfiable)
@@ -50,47 +52,227 @@ class ResolutionChecker:
         Returns:
             - True if the clauses are unsatisfiable;
             - False otherwise.
+
+        The string literals are only used at the boundary: every atom is
+        interned to a bit index, each clause becomes a (pos_mask, neg_mask)
+        pair, and the search runs on bitwise operations in resolve_bitsets().
         """
+        _, encoded = ResolutionChecker.encode_clauses(clauses)
+        return ResolutionChecker.resolve_bitsets(encoded)
 
+    @staticmethod
+    def encode_clauses(clauses: List[AbstractSet[str]], atoms: Dict[str, int] = None) -> Tuple[Dict[str, int], List[Tuple[int, int]]]:
+        """
+        Encode clauses of string literals as pairs of bitmasks (pos_mask, neg_mask).
 
-        # Convert each clause to a frozenset for immutability and set operations
-        # It allows me to use set operations to check for new resolvents
-        # and to avoid duplicates in the clause set.
-        new_clauses = set(frozenset(clause) for clause in clauses)
-        
-        while True:
-            new_resolvents = []
-            
-            # Convert to list for iteration
-            clause_list = list(new_clauses)
-            #print(f"Current clauses: {clause_list}")
-
-            # Try to resolve each pair of clauses
-            for i in range(len(clause_list)):
-                for j in range(i + 1, len(clause_list)):
-                    clause1 = set(clause_list[i])
-                    clause2 = set(clause_list[j])
-                    
-                    resolvents = ResolutionChecker.resolve(clause1, clause2)
-                    
-                    #print(f"Resolving {clause1} and {clause2} gives: {resolvents}")
-
-                    # Check if any resolvent is the empty clause
-                    for resolvent in resolvents:
-                        if len(resolvent) == 0:
-                            return True  # Unsatisfiable
-                        # Add non-empty resolvents to the new resolvents list
-                        new_resolvents.append(resolvent)
-            
-            # Convert new resolvents to frozensets for set operations
-            new_resolvents_set = {frozenset(r) for r in new_resolvents}
-            
-            # If no new clauses were derived, we're done
-            if new_resolvents_set.issubset(new_clauses):
-                return False  # Satisfiable
-            
-            # Add new resolvents to our clause set
-            new_clauses.update(new_resolvents_set)
+        Every atom gets a bit index; bit i of pos_mask is set if the clause contains
+        the atom, bit i of neg_mask if it contains its negation. Python integers are
+        unbounded, so there is no limit on the number of atoms.
+
+        Pass an existing atom -> bit index mapping to encode several clause sets
+        consistently; new atoms are added to it.
+
+        Returns the atom -> bit index mapping and the encoded clauses.
+        """
+        if atoms is None:
+            atoms = {}
+        encoded = []
+        for clause in clauses:
+            pos_mask = neg_mask = 0
+            for literal in clause:
+                if literal.startswith('¬'):
+                    neg_mask |= 1 << atoms.setdefault(literal[1:], len(atoms))
+                else:
+                    pos_mask |= 1 << atoms.setdefault(literal, len(atoms))
+            encoded.append((pos_mask, neg_mask))
+        return atoms, encoded
+
+    @staticmethod
+    def simplify(clauses: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Prepare bitmask-encoded clauses for resolution by removing redundant ones:
+            1. Tautologies, which are always true and never needed in a refutation
+            2. Duplicate clauses
+            3. Subsumed clauses: C is dropped if some other clause S ⊆ C, since
+               any refutation using C can use S instead
+        """
+        unique = {(pos, neg) for pos, neg in clauses if not pos & neg}
+        kept = []
+        # Shorter clauses first, so every possible subsumer is seen before its supersets
+        for pos, neg in sorted(unique, key=lambda c: (c[0] | c[1]).bit_count()):
+            if any(not (s_pos & ~pos) and not (s_neg & ~neg) for s_pos, s_neg in kept):
+                continue
+            kept.append((pos, neg))
+        return kept
+
+    @staticmethod
+    def propagate(clauses: List[Tuple[int, int]]) -> Tuple[List[Tuple[int, int]], bool]:
+        """
+        Simplify bitmask-encoded clauses before resolution, keeping satisfiability:
+            1. Unit propagation: a one-literal clause forces its literal, so clauses
+               containing it are satisfied and its negation is deleted elsewhere
+            2. Pure literal elimination: an atom that only occurs with one sign can
+               be set to satisfy all its clauses, which are then dropped
+
+        Returns the remaining clauses and the outcome if it is already decided:
+            - True if the clauses are unsatisfiable (an empty clause appeared);
+            - False if they are satisfiable (no clause is left);
+            - None if the remaining clauses still need resolution.
+        """
+        # Tautologies (P ∨ ¬P) are always true, and {P, ¬P} would pass for a unit of both signs
+        clauses = [(pos, neg) for pos, neg in clauses if not pos & neg]
+        while clauses:
+            unit_pos = unit_neg = 0
+            for pos, neg in clauses:
+                literal = pos | neg
+                if not literal & (literal - 1):  # A single literal
+                    unit_pos |= pos
+                    unit_neg |= neg
+            if unit_pos & unit_neg:
+                return [], True  # Units P and ¬P contradict each other
+
+            if unit_pos or unit_neg:
+                remaining = []
+                for pos, neg in clauses:
+                    if pos & unit_pos or neg & unit_neg:
+                        continue  # Satisfied by a unit
+                    pos &= ~unit_neg
+                    neg &= ~unit_pos
+                    if not pos and not neg:
+                        return [], True  # Every literal was falsified
+                    remaining.append((pos, neg))
+                clauses = remaining
+                continue
+
+            all_pos = all_neg = 0
+            for pos, neg in clauses:
+                all_pos |= pos
+                all_neg |= neg
+            pure_pos = all_pos & ~all_neg
+            pure_neg = all_neg & ~all_pos
+            if not pure_pos and not pure_neg:
+                return clauses, None
+            clauses = [(pos, neg) for pos, neg in clauses if not (pos & pure_pos or neg & pure_neg)]
+
+        return [], False
+
+    @staticmethod
+    def subsumes(clause1: Tuple[int, int], clause2: Tuple[int, int]) -> bool:
+        """Check if clause1 ⊆ clause2 for bitmask-encoded clauses."""
+        return not (clause1[0] & ~clause2[0]) and not (clause1[1] & ~clause2[1])
+
+    @staticmethod
+    def literals(clause: Tuple[int, int]) -> List[int]:
+        """
+        List the literals of a bitmask-encoded clause as integers: the bit of
+        the atom for a positive literal, its negation for a negative one.
+        """
+        literals = []
+        pos, neg = clause
+        while pos:
+            bit = pos & -pos
+            literals.append(bit)
+            pos ^= bit
+        while neg:
+            bit = neg & -neg
+            literals.append(-bit)
+            neg ^= bit
+        return literals
+
+    @staticmethod
+    def resolve_bitsets(clauses: List[Tuple[int, int]]) -> bool:
+        """
+        Bitmask version of resolution() working on clauses from encode_clauses().
+
+        Uses a given-clause loop: each clause is resolved once against every
+        clause processed before it, so no pair of clauses is ever resolved twice.
+        New resolvents go through:
+            - Tautology deletion: P ∨ ¬P is always true
+            - Forward subsumption: dropped if an existing clause is a subset of it
+            - Backward subsumption: existing clauses that are supersets of it are deleted
+        Subsumption candidates are looked up in literal -> clauses indexes, so
+        only clauses sharing a literal with the resolvent are compared.
+
+        Returns:
+            - True if the clauses are unsatisfiable;
+            - False otherwise.
+        """
+        # Tautologies (P ∨ ¬P) can never help derive the empty clause
+        initial = {(pos, neg) for pos, neg in clauses if not pos & neg}
+        if (0, 0) in initial:
+            return True
+
+        subsumes = ResolutionChecker.subsumes
+        literals = ResolutionChecker.literals
+        # Clauses kept so far (processed or waiting); subsumed ones get removed
+        active = set(initial)
+        # Literal -> active clauses containing it, for backward subsumption and
+        # for finding resolution partners
+        index = {}
+        # Literal -> active clauses filed under it, for forward subsumption: every
+        # clause is filed under one of its literals, so a subset of a clause R is
+        # found exactly once by looking up the literals of R. The rarest literal is
+        # picked, as it is the least likely to be looked up.
+        watch_index = {}
+        watched = {}  # Clause -> literal it is filed under
+        for clause in active:
+            for literal in literals(clause):
+                index.setdefault(literal, set()).add(clause)
+        for clause in active:
+            literal = min(literals(clause), key=lambda l: len(index[l]))
+            watched[clause] = literal
+            watch_index.setdefault(literal, set()).add(clause)
+        # Short clauses first: they produce short resolvents and reach the empty clause sooner
+        unprocessed = deque(sorted(initial, key=lambda c: (c[0] | c[1]).bit_count()))
+        processed = set()
+
+        while unprocessed:
+            given = unprocessed.popleft()
+            if given not in active:
+                continue  # Deleted by backward subsumption while waiting
+            pos1, neg1 = given
+
+            resolvents = []
+            # Only clauses containing the complement of one of its literals can resolve with it
+            partners = [clause for literal in literals(given) for clause in index.get(-literal, ())]
+            for pos2, neg2 in processed.intersection(partners):
+                # Atoms appearing positively in one clause and negatively in the other
+                clash = (pos1 & neg2) | (neg1 & pos2)
+                # No clash: nothing to resolve. Several clashes: every resolvent is a tautology
+                if not clash or clash & (clash - 1):
+                    continue
+
+                resolvent = ((pos1 | pos2) & ~clash, (neg1 | neg2) & ~clash)
+                if resolvent == (0, 0):
+                    return True  # Empty clause: unsatisfiable
+                if not resolvent[0] & resolvent[1]:
+                    resolvents.append(resolvent)
+            processed.add(given)
+
+            for resolvent in resolvents:
+                resolvent_literals = literals(resolvent)
+                # A subset of the resolvent is filed under one of the resolvent's literals
+                if any(subsumes(clause, resolvent)
+                       for literal in resolvent_literals for clause in watch_index.get(literal, ())):
+                    continue
+                # A superset of the resolvent contains all of its literals
+                buckets = [index.get(literal) for literal in resolvent_literals]
+                subsumed = set.intersection(*buckets) if all(buckets) else ()
+                for clause in subsumed:
+                    watch_index[watched.pop(clause)].discard(clause)
+                    for literal in literals(clause):
+                        index[literal].discard(clause)
+                active.difference_update(subsumed)
+                processed.difference_update(subsumed)
+                active.add(resolvent)
+                literal = min(resolvent_literals, key=lambda l: len(index.get(l, ())))
+                watched[resolvent] = literal
+                watch_index.setdefault(literal, set()).add(resolvent)
+                for literal in resolvent_literals:
+                    index.setdefault(literal, set()).add(resolvent)
+                unprocessed.append(resolvent)
+
+        return False  # Saturated without the empty clause: satisfiable
 
 if __name__ == "__main__":
     # Test the resolve method with the following example:
@@ -1,4 +1,7 @@
-from belief_base import BeliefBase
+import random
+from itertools import combinations
+
+from belief_base import BeliefBase, _entails
 
 def test_success():
     print("Testing SUCCESS postulate...")
@@ -56,6 +59,133 @@ def test_extensionality():
     assert set(bb1.list_formulas()) == set(bb2.list_formulas()), "Equivalent formulas should yield identical contractions"
     print("EXTENSIONALITY postulate passed.")
 
+def test_several_kernels():
+    print("Testing contraction with several kernels...")
+    bb = BeliefBase()
+    for f in ["P", "P → Q", "R", "R → Q", "S"]:
+        bb.add_formula(f)
+    kernels = bb._find_kernels("Q")
+    assert set(kernels) == {frozenset({"P", "P → Q"}), frozenset({"R", "R → Q"})}, f"Unexpected kernels: {kernels}"
+    assert bb.contraction("Q")
+    assert not bb.entails("Q"), "Q should NOT be entailed after contraction"
+    remaining = set(bb.list_formulas())
+    # One belief out of each kernel goes, nothing else
+    assert len(remaining) == 3 and "S" in remaining, f"Unexpected remaining beliefs: {remaining}"
+    print("Several kernels passed.")
+
+def test_kernels_brute_force():
+    print("Testing kernels against brute force...")
+    rng = random.Random(1)
+    atoms = ["P", "Q", "R"]
+    def literal():
+        return rng.choice(["", "¬"]) + rng.choice(atoms)
+    def formula():
+        return f"{literal()} {rng.choice('∧∨→↔')} {literal()}" if rng.random() < 0.7 else literal()
+
+    for _ in range(60):
+        bb = BeliefBase()
+        for _ in range(rng.randint(1, 5)):
+            bb.add_formula(formula())
+        target = literal()
+        base = bb.list_formulas()
+        entailing = [frozenset(subset) for size in range(len(base) + 1)
+                     for subset in combinations(base, size) if _entails(frozenset(subset), target)]
+        expected = {s for s in entailing if not any(t < s for t in entailing)}
+        kernels = bb._find_kernels(target) if bb.entails(target) else []
+        assert set(kernels) == expected, f"Kernels of {target} in {base}: {kernels}, expected {expected}"
+    print("Kernels brute force passed.")
+
+def test_priority_choice():
+    print("Testing priority-driven contraction...")
+    bb = BeliefBase()
+    bb.add_formula("P", priority=3)
+    bb.add_formula("P → Q", priority=1)
+    bb.contraction("Q")
+    assert bb.list_formulas() == ["P"], "The less entrenched 'P → Q' should be removed"
+
+    bb = BeliefBase()
+    bb.add_formula("P", priority=1)
+    bb.add_formula("P → Q", priority=3)
+    bb.contraction("Q")
+    assert bb.list_formulas() == ["P → Q"], "The less entrenched 'P' should be removed"
+    print("Priority choice passed.")
+
+def test_equal_priority_choice():
+    print("Testing contraction between equal priorities...")
+    # Between equal priorities the most recently added belief goes first
+    bb = BeliefBase()
+    bb.add_formula("P")
+    bb.add_formula("¬P ∨ Q")
+    bb.contraction("Q")
+    assert bb.list_formulas() == ["P"], f"'¬P ∨ Q' should be removed, got {bb.list_formulas()}"
+
+    bb = BeliefBase()
+    for f in ["P", "P → Q", "R", "R → Q", "S"]:
+        bb.add_formula(f)
+    bb.contraction("Q")
+    assert bb.list_formulas() == ["P", "R", "S"], f"Unexpected remaining beliefs: {bb.list_formulas()}"
+    print("Equal priority choice passed.")
+
+def test_tautology_contraction():
+    print("Testing contraction of a tautology...")
+    bb = BeliefBase()
+    bb.add_formula("P")
+    bb.add_formula("¬P ∨ Q")
+    before = bb.list_formulas()
+    assert not bb.contraction("P ∨ ¬P"), "A tautology cannot be contracted"
+    assert bb.list_formulas() == before, "Belief base should be unchanged"
+    print("Tautology contraction passed.")
+
+def test_parallel_contraction():
+    print("Testing parallel contraction...")
+    formulas = [("P", 2), ("P → Q", 1), ("R", 1), ("R → Q", 3), ("P ∧ R", 2), ("S", 1)]
+    sequential = BeliefBase()
+    parallel = BeliefBase()
+    for f, priority in formulas:
+        sequential.add_formula(f, priority)
+        parallel.add_formula(f, priority)
+    assert sequential.contraction("Q")
+    assert parallel.contraction("Q", workers=2)
+    assert parallel.list_formulas() == sequential.list_formulas(), "workers=2 should give the sequential result"
+    print("Parallel contraction passed.")
+
+def test_formula_spelling():
+    print("Testing canonical formula spelling...")
+    bb = BeliefBase()
+    bb.add_formula("¬ P∨Q")
+    bb.add_formula("¬P ∨ Q")
+    assert bb.list_formulas() == ["¬P ∨ Q"], f"Both spellings should be one belief, got {bb.list_formulas()}"
+    bb.add_formula("P")
+    assert bb.entails("Q") and bb.entails(" Q "), "Q should be entailed"
+    assert bb.entails("¬ P∨Q") and bb.entails("¬P ∨ Q"), "The belief should be entailed in either spelling"
+    assert bb.contraction("¬ P∨Q"), "Contraction should accept the other spelling"
+    assert not bb.entails("¬P ∨ Q"), "'¬P ∨ Q' should NOT be entailed after contraction"
+    assert bb.list_formulas() == ["P"], f"Unexpected remaining beliefs: {bb.list_formulas()}"
+    print("Formula spelling passed.")
+
+def test_double_negation_query():
+    print("Testing double negation in queries...")
+    formulas = [("P", 2), ("P → Q", 1), ("R", 1), ("R → Q", 2), ("¬S", 1)]
+    bb = BeliefBase()
+    for f, priority in formulas:
+        bb.add_formula(f, priority)
+    for query in ["Q", "S", "¬S", "P ∧ Q", "T"]:
+        for negations in (2, 4):
+            doubled = "¬" * negations + query
+            assert bb.entails(doubled) == bb.entails(query), f"'{doubled}' and '{query}' should agree"
+    assert bb.entails("¬¬¬S") and not bb.entails("¬¬¬¬S"), "Odd and even negations should differ"
+
+    plain = BeliefBase()
+    doubled = BeliefBase()
+    for f, priority in formulas:
+        plain.add_formula(f, priority)
+        doubled.add_formula(f, priority)
+    plain.contraction("Q")
+    doubled.contraction("¬¬Q")
+    assert doubled.list_formulas() == plain.list_formulas() == ["P", "R → Q", "¬S"], \
+        f"'¬¬Q' removed {doubled.list_formulas()}, 'Q' removed {plain.list_formulas()}"
+    print("Double negation passed.")
+
 if __name__ == "__main__":
     tests = [
         ("SUCCESS", test_success),
@@ -63,6 +193,14 @@ if __name__ == "__main__":
         ("VACUITY", test_vacuity),
         ("CONSISTENCY", test_consistency),
         ("EXTENSIONALITY", test_extensionality),
+        ("SEVERAL KERNELS", test_several_kernels),
+        ("KERNELS BRUTE FORCE", test_kernels_brute_force),
+        ("PRIORITY CHOICE", test_priority_choice),
+        ("EQUAL PRIORITY CHOICE", test_equal_priority_choice),
+        ("TAUTOLOGY CONTRACTION", test_tautology_contraction),
+        ("PARALLEL CONTRACTION", test_parallel_contraction),
+        ("FORMULA SPELLING", test_formula_spelling),
+        ("DOUBLE NEGATION QUERY", test_double_negation_query),
     ]
 
     print("Running AGM Postulate Tests...\n")
@@ -0,0 +1,92 @@
+import belief_base
+from belief_base import BeliefBase
+from cnf_converter import cnf_of_negation
+from cnf_converter_ast import to_cnf_tseitin
+
+def _clear_caches():
+    for cached in (belief_base._formula_clauses, belief_base._formula_atoms, belief_base._negated_formula_clauses,
+                   belief_base._is_inconsistent, belief_base._entails):
+        cached.cache_clear()
+
+def test_literal_query_names_are_checked():
+    print("Testing atom name check on literal queries...")
+    for query in ["1P", "¬1P", "#14", "¬#14"]:
+        try:
+            cnf_of_negation(query)
+        except ValueError:
+            continue
+        raise AssertionError(f"'{query}' should be rejected like in a compound formula")
+    assert cnf_of_negation("P") == [{"¬P"}]
+    assert cnf_of_negation("¬P") == [{"P"}]
+
+    # '#n' names Tseitin auxiliary atoms, so a user query must not reach them
+    bb = BeliefBase()
+    bb.add_formula(" ∨ ".join(f"(a{i} ∧ b{i})" for i in range(8)))
+    try:
+        bb.entails("#14")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("'#14' should be rejected, not matched against an auxiliary atom")
+    print("Atom name check passed.")
+
+def test_tseitin_entailment():
+    print("Testing entailment with Tseitin-encoded formulas...")
+    # 2⁵ clauses in CNF. The threshold is lowered below that, so the plain CNF
+    # run stays fast enough to compare against.
+    big = " ∨ ".join(f"(a{i} ∧ b{i})" for i in range(1, 6))
+    queries = [
+        " ∨ ".join(f"a{i}" for i in range(1, 6)),
+        " ∨ ".join(f"{'a' if i % 2 else 'b'}{i}" for i in range(1, 6)),
+        "a1 ∨ a2",
+        "a1",
+        big,
+        f"¬({big})",  # Its negation is the big formula
+        f"c ∨ ({big})",
+    ]
+
+    def answers(tseitin_above):
+        _clear_caches()
+        belief_base._TSEITIN_ABOVE = tseitin_above
+        bb = BeliefBase()
+        bb.add_formula(big)
+        bb.add_formula("¬a1 ∨ c")
+        return [bb.entails(query) for query in queries]
+
+    threshold = belief_base._TSEITIN_ABOVE
+    try:
+        with_tseitin = answers(16)
+        assert any(atom.startswith("#") for atom in belief_base._ATOM_IDS), "The Tseitin encoding should have been used"
+        without_tseitin = answers(None)
+    finally:
+        belief_base._TSEITIN_ABOVE = threshold
+        _clear_caches()
+    assert with_tseitin == without_tseitin, f"Tseitin: {with_tseitin}, plain CNF: {without_tseitin}"
+    assert with_tseitin == [True, True, False, False, True, False, True]
+    print("Tseitin entailment passed.")
+
+def test_tseitin_names_reused():
+    print("Testing reuse of Tseitin atom names...")
+    formula = "(p ∧ q) ∨ (r ∧ s)"
+    assert to_cnf_tseitin(formula) == to_cnf_tseitin(formula), "Re-encoding a formula should not create new atoms"
+    print("Tseitin atom names passed.")
+
+if __name__ == "__main__":
+    tests = [
+        ("LITERAL QUERY NAMES", test_literal_query_names_are_checked),
+        ("TSEITIN ENTAILMENT", test_tseitin_entailment),
+        ("TSEITIN ATOM NAMES", test_tseitin_names_reused),
+    ]
+
+    print("Running CNF converter tests...\n")
+    passed = 0
+
+    for name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"{name} test FAILED: {e}")
+        print("-" * 50)
+
+    print(f"\n {passed}/{len(tests)} tests passed.")
\ No newline at end of file
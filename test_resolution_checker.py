@@ -0,0 +1,66 @@
+import random
+from itertools import product
+
+from resolution_checker import ResolutionChecker
+
+def _satisfiable(clauses, atoms):
+    """Brute force: try every assignment of the atoms."""
+    for values in product([False, True], repeat=len(atoms)):
+        true = {atom for atom, value in zip(atoms, values) if value}
+        if all(any(literal[1:] not in true if literal.startswith("¬") else literal in true for literal in clause)
+               for clause in clauses):
+            return True
+    return False
+
+def _random_clause_sets(seed, count):
+    rng = random.Random(seed)
+    for _ in range(count):
+        atoms = [f"x{i}" for i in range(rng.randint(1, 5))]
+        clauses = [{rng.choice(["", "¬"]) + rng.choice(atoms) for _ in range(rng.randint(1, 3))}
+                   for _ in range(rng.randint(1, 12))]
+        yield atoms, clauses
+
+def test_resolve_bitsets_brute_force():
+    print("Testing resolve_bitsets against brute force...")
+    for atoms, clauses in _random_clause_sets(0, 1200):
+        expected = not _satisfiable(clauses, atoms)
+        _, encoded = ResolutionChecker.encode_clauses(clauses)
+        assert ResolutionChecker.resolve_bitsets(encoded) == expected, f"resolve_bitsets on {clauses}"
+        assert ResolutionChecker.resolution(clauses) == expected, f"resolution on {clauses}"
+    print("resolve_bitsets brute force passed.")
+
+def test_propagate_brute_force():
+    print("Testing propagate against brute force...")
+    for atoms, clauses in _random_clause_sets(1, 1200):
+        unsatisfiable = not _satisfiable(clauses, atoms)
+        atom_ids, encoded = ResolutionChecker.encode_clauses(clauses)
+        for prepared in (encoded, ResolutionChecker.simplify(encoded)):
+            remaining, outcome = ResolutionChecker.propagate(prepared)
+            if outcome is not None:
+                assert outcome == unsatisfiable, f"propagate decided {outcome} on {clauses}"
+                continue
+            # Undecided: the remaining clauses must be satisfiable exactly when the input is
+            names = {1 << bit: atom for atom, bit in atom_ids.items()}
+            decoded = [{names[lit] if lit > 0 else "¬" + names[-lit] for lit in ResolutionChecker.literals(clause)}
+                       for clause in remaining]
+            assert (not _satisfiable(decoded, atoms)) == unsatisfiable, f"propagate left {decoded} from {clauses}"
+    print("propagate brute force passed.")
+
+if __name__ == "__main__":
+    tests = [
+        ("RESOLVE BITSETS", test_resolve_bitsets_brute_force),
+        ("PROPAGATE", test_propagate_brute_force),
+    ]
+
+    print("Running resolution checker tests...\n")
+    passed = 0
+
+    for name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"{name} test FAILED: {e}")
+        print("-" * 50)
+
+    print(f"\n {passed}/{len(tests)} tests passed.")
\ No newline at end of file